@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from app.schemas.analysis import AnalysisRequest, AnalysisResponse
 from app.services.llm_service import analyze_text, LLMError
 from app.services.nlp_service import extract_top_nouns
+from app.services.response_parser import get_parser_metrics
 from app.db.database import SessionLocal
 from app.db import crud
 from app.db.models import Base
@@ -142,3 +143,9 @@ async def search(topic: Optional[str] = Query(default=None), db: Session = Depen
 		)
 		for r in results
 	]
+
+
+@router.get("/metrics")
+async def metrics():
+    """Return LLM response repair and re-ask counters and rates."""
+    return get_parser_metrics()
@@ -1,5 +1,6 @@
+import re
 from pydantic import BaseModel, Field, field_validator
-from typing import List
+from typing import Any, List
 from datetime import datetime
 from app.utils.text_utils import clean_text
 
@@ -25,3 +26,56 @@ class AnalysisResponse(BaseModel):
 
 	class Config:
 		from_attributes = True
+
+
+SENTIMENTS = ("positive", "neutral", "negative")
+
+
+def _flatten_topics(items: Any) -> List[str]:
+	"""Flatten nested topic lists, accepting only strings and numbers."""
+	topics: List[str] = []
+	for item in items:
+		if isinstance(item, (list, tuple)):
+			topics.extend(_flatten_topics(item))
+		elif isinstance(item, str):
+			topics.extend(t.strip() for t in item.split(',') if t.strip())
+		elif isinstance(item, (int, float)) and not isinstance(item, bool):
+			topics.append(str(item))
+		elif item is not None:
+			raise ValueError(f"topics must contain only strings, got {type(item).__name__}")
+	return topics
+
+
+class LLMAnalysisResult(BaseModel):
+	"""Schema that every provider response must satisfy before it is persisted."""
+	summary: str = Field(min_length=1)
+	title: str = Field(min_length=1)
+	topics: List[str] = Field(min_length=1)
+	sentiment: str = "neutral"
+
+	@field_validator('summary', 'title', mode='before')
+	@classmethod
+	def strip_strings(cls, v: Any) -> Any:
+		"""Trim whitespace so blank values count as missing."""
+		return v.strip() if isinstance(v, str) else v
+
+	@field_validator('topics', mode='before')
+	@classmethod
+	def coerce_topics(cls, v: Any) -> List[str]:
+		"""Accept a comma separated string or nested list and normalize it to a flat list of strings."""
+		if isinstance(v, (str, int, float)) and not isinstance(v, bool):
+			v = [v]
+		if not isinstance(v, (list, tuple)):
+			raise ValueError(f"topics must be a list of strings, got {type(v).__name__}")
+		return _flatten_topics(v)
+
+	@field_validator('sentiment', mode='before')
+	@classmethod
+	def normalize_sentiment(cls, v: Any) -> str:
+		"""Lower-case and strip punctuation; anything still unrecognised is invalid."""
+		if not isinstance(v, str):
+			raise ValueError(f"sentiment must be a string, got {type(v).__name__}")
+		v = re.sub(r'[^a-z]', '', v.lower())
+		if v not in SENTIMENTS:
+			raise ValueError(f"sentiment must be one of {', '.join(SENTIMENTS)}")
+		return v
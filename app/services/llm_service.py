@@ -1,7 +1,7 @@
 from typing import Dict
-import json
 import httpx
 from app.config import get_llm_client_config
+from app.services.response_parser import parse_analysis_response
 from app.utils.text_utils import load_prompt
 from app.utils.logger import get_logger
 
@@ -23,16 +23,11 @@ def _get_mock_response(text: str) -> Dict:
 	}
 
 
-def _analyze_with_openai(text: str, config: Dict) -> Dict:
-	"""Analyze text using OpenAI."""
+def _complete_with_openai(prompt: str, config: Dict) -> str:
+	"""Send a prompt to OpenAI and return the raw reply text."""
 	from openai import OpenAI
 	
-	logger.info(f"Analyzing text with OpenAI model: {config['model']}")
-	logger.debug(f"Text length: {len(text)} characters")
-	
 	client = OpenAI(api_key=config["api_key"])
-	prompt_template = load_prompt()
-	prompt = f"{prompt_template}\n{text}"
 	
 	logger.debug("Sending request to OpenAI API")
 	resp = client.chat.completions.create(
@@ -42,19 +37,24 @@ def _analyze_with_openai(text: str, config: Dict) -> Dict:
 	)
 	content = resp.choices[0].message.content
 	logger.info("OpenAI API request completed successfully")
-	return json.loads(content)
+	return content
 
 
-def _analyze_with_claude(text: str, config: Dict) -> Dict:
-	"""Analyze text using Claude."""
-	from anthropic import Anthropic
-	
-	logger.info(f"Analyzing text with Claude model: {config['model']}")
+def _analyze_with_openai(text: str, config: Dict) -> Dict:
+	"""Analyze text using OpenAI."""
+	logger.info(f"Analyzing text with OpenAI model: {config['model']}")
 	logger.debug(f"Text length: {len(text)} characters")
 	
+	prompt = f"{load_prompt()}\n{text}"
+	raw = _complete_with_openai(prompt, config)
+	return parse_analysis_response(raw, text, reask=lambda p: _complete_with_openai(p, config))
+
+
+def _complete_with_claude(prompt: str, config: Dict) -> str:
+	"""Send a prompt to Claude and return the raw reply text."""
+	from anthropic import Anthropic
+	
 	client = Anthropic(api_key=config["api_key"])
-	prompt_template = load_prompt()
-	prompt = f"{prompt_template}\n{text}"
 	
 	logger.debug("Sending request to Claude API")
 	resp = client.messages.create(
@@ -64,17 +64,21 @@ def _analyze_with_claude(text: str, config: Dict) -> Dict:
 	)
 	content = resp.content[0].text
 	logger.info("Claude API request completed successfully")
-	return json.loads(content)
+	return content
 
 
-def _analyze_with_llama(text: str, config: Dict) -> Dict:
-	"""Analyze text using local Llama model via Ollama."""
-	logger.info(f"Analyzing text with Llama model: {config['model']} at {config['base_url']}")
+def _analyze_with_claude(text: str, config: Dict) -> Dict:
+	"""Analyze text using Claude."""
+	logger.info(f"Analyzing text with Claude model: {config['model']}")
 	logger.debug(f"Text length: {len(text)} characters")
 	
-	prompt_template = load_prompt()
-	prompt = f"{prompt_template}\n{text}"
-	
+	prompt = f"{load_prompt()}\n{text}"
+	raw = _complete_with_claude(prompt, config)
+	return parse_analysis_response(raw, text, reask=lambda p: _complete_with_claude(p, config))
+
+
+def _complete_with_llama(prompt: str, config: Dict) -> str:
+	"""Send a prompt to the local Ollama server and return the raw reply text."""
 	payload = {
 		"model": config["model"],
 		"prompt": prompt,
@@ -91,7 +95,17 @@ def _analyze_with_llama(text: str, config: Dict) -> Dict:
 		response.raise_for_status()
 		result = response.json()
 		logger.info("Ollama API request completed successfully")
-		return json.loads(result["response"])
+		return result["response"]
+
+
+def _analyze_with_llama(text: str, config: Dict) -> Dict:
+	"""Analyze text using local Llama model via Ollama."""
+	logger.info(f"Analyzing text with Llama model: {config['model']} at {config['base_url']}")
+	logger.debug(f"Text length: {len(text)} characters")
+	
+	prompt = f"{load_prompt()}\n{text}"
+	raw = _complete_with_llama(prompt, config)
+	return parse_analysis_response(raw, text, reask=lambda p: _complete_with_llama(p, config))
 
 
 def analyze_text(text: str) -> Dict:
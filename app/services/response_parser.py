@@ -0,0 +1,163 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import Counter
+import json
+import threading
+from pydantic import ValidationError
+from app.schemas.analysis import LLMAnalysisResult
+from app.utils.text_utils import repair_llm_json
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUIRED_FIELDS = ("summary", "title", "topics", "sentiment")
+
+REASK_PROMPT = (
+	"Your previous answer was missing or had invalid values for: {fields}.\n"
+	"Return ONLY a JSON object with exactly these keys: {fields}.\n"
+	"Use the same schema as before: summary and title are strings, topics is a list of "
+	"3 single-word strings, sentiment is one of positive/neutral/negative.\n\n"
+	"{context}"
+)
+
+_metrics_lock = threading.Lock()
+_metrics: Counter = Counter()
+
+
+class ResponseValidationError(ValueError):
+	pass
+
+
+def _record(*names: str) -> None:
+	with _metrics_lock:
+		for name in names:
+			_metrics[name] += 1
+
+
+def get_parser_metrics() -> Dict:
+	"""Return response post-processing counters and repair/re-ask rates."""
+	with _metrics_lock:
+		counts = dict(_metrics)
+	total = counts.get("responses_total", 0)
+
+	def rate(name: str) -> float:
+		return round(counts.get(name, 0) / total, 4) if total else 0.0
+
+	return {
+		"counts": counts,
+		"repair_rate": rate("repaired_locally"),
+		"reask_rate": rate("reask_issued"),
+		"reask_full_text_rate": rate("reask_full_text"),
+		"failure_rate": rate("failed"),
+	}
+
+
+def reset_parser_metrics() -> None:
+	"""Clear all post-processing counters."""
+	with _metrics_lock:
+		_metrics.clear()
+
+
+def _invalid_fields(data: Dict) -> List[str]:
+	"""Return the schema fields that are missing or fail validation."""
+	try:
+		LLMAnalysisResult.model_validate(data)
+		return []
+	except ValidationError as exc:
+		fields = {str(err["loc"][0]) for err in exc.errors() if err["loc"]}
+		# A non-object payload has no field locations, so everything needs re-asking
+		return [f for f in REQUIRED_FIELDS if f in fields] or list(REQUIRED_FIELDS)
+
+
+def _parse_raw(raw: Optional[str]) -> Tuple[Dict, List[str]]:
+	"""Parse and locally repair raw model text into a dict."""
+	if not isinstance(raw, str):
+		logger.warning(f"Model output is not text: {type(raw).__name__}")
+		_record("unparseable")
+		return {}, []
+	try:
+		data, repairs = repair_llm_json(raw)
+	except json.JSONDecodeError:
+		logger.warning("Could not repair model output locally")
+		_record("unparseable")
+		return {}, []
+	if not isinstance(data, dict):
+		_record("unparseable")
+		return {}, repairs
+	return data, repairs
+
+
+def _coercions(data: Dict, result: Dict) -> List[str]:
+	"""Return the fields whose values the schema had to normalize."""
+	coerced = []
+	if data.get("topics") != result["topics"]:
+		coerced.append("topics_coerced")
+	if "sentiment" in data and data["sentiment"] != result["sentiment"]:
+		coerced.append("sentiment_coerced")
+	return coerced
+
+
+def _build_reask_prompt(fields: List[str], partial: Dict, text: str) -> Tuple[str, bool]:
+	"""
+	Build a follow-up prompt asking only for the invalid fields.
+	The known summary is enough context for the other fields; without one the
+	full text has to be sent again. Returns the prompt and whether the text was included.
+	"""
+	known = {k: v for k, v in partial.items() if k in REQUIRED_FIELDS and k not in fields}
+	context = f"Known fields:\n{json.dumps(known)}"
+	full_text = "summary" in fields
+	if full_text:
+		context += f"\n\nText:\n{text}"
+	return REASK_PROMPT.format(fields=", ".join(fields), context=context), full_text
+
+
+def parse_analysis_response(
+	raw: Optional[str],
+	text: str,
+	reask: Optional[Callable[[str], str]] = None,
+) -> Dict:
+	"""
+	Validate provider output against the analysis schema.
+	Common defects are repaired locally; only if that fails is a single re-ask
+	issued for the invalid fields. The text is only sent again when no summary was recovered.
+	"""
+	_record("responses_total")
+	data, repairs = _parse_raw(raw)
+	_record(*(f"repair_{r}" for r in repairs))
+	fields = _invalid_fields(data)
+
+	if fields:
+		if reask is None:
+			_record("failed")
+			raise ResponseValidationError(f"Invalid model output, fields: {', '.join(fields)}")
+
+		prompt, full_text = _build_reask_prompt(fields, data, text)
+		logger.info(f"Re-asking model for fields: {', '.join(fields)}")
+		_record("reask_issued")
+		if full_text:
+			logger.warning("No usable summary in model output, re-asking with the full text")
+			_record("reask_full_text")
+		try:
+			partial, reask_repairs = _parse_raw(reask(prompt))
+		except Exception:
+			_record("failed")
+			raise
+		_record(*(f"reask_repair_{r}" for r in reask_repairs))
+		data = {**data, **{k: v for k, v in partial.items() if k in fields}}
+		invalid = _invalid_fields(data)
+		if invalid:
+			_record("failed")
+			raise ResponseValidationError(
+				f"Invalid model output after re-ask, fields: {', '.join(invalid)}"
+			)
+		_record("reask_succeeded")
+
+	result = LLMAnalysisResult.model_validate(data).model_dump()
+	coercions = _coercions(data, result)
+	_record(*(f"repair_{c}" for c in coercions))
+	if not fields:
+		if repairs or coercions:
+			logger.info(f"Model output repaired locally: {', '.join(repairs + coercions)}")
+			_record("repaired_locally")
+		else:
+			_record("parsed_clean")
+	return result
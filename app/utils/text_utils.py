@@ -1,6 +1,8 @@
 import re
 import os
+import json
 from pathlib import Path
+from typing import Any, List, Optional, Tuple
 
 
 def clean_text(text: str) -> str:
@@ -56,6 +58,144 @@ def make_json_valid(json_str: str) -> str:
         logger.error(f"Error fixing JSON: {e}")
         return json_str
 
+_FENCED_RE = re.compile(r'^\s*```(?:json|JSON)?\s*\n(.*?)\n?```\s*$', re.DOTALL)
+_OPEN_FENCE_RE = re.compile(r'^\s*```(?:json|JSON)?\s*\n')
+
+
+def strip_code_fences(text: str) -> str:
+	"""Remove a markdown code fence wrapping the whole reply, including one left unclosed by truncation."""
+	fenced = _FENCED_RE.match(text)
+	if fenced:
+		return fenced.group(1)
+	opening = _OPEN_FENCE_RE.match(text)
+	if opening:
+		return text[opening.end():]
+	return text
+
+
+def _scan_json(text: str) -> Tuple[str, int, List[Tuple[int, str]], List[str], bool, bool]:
+	"""
+	Walk the text once, tracking string state and open brackets, and stop after the
+	first complete top-level value. Drops commas that directly precede a closing bracket.
+	Returns the cleaned text, how many input characters were consumed,
+	the cut points (separators and nested opening brackets) with the closers needed at each one,
+	the closers still open at the end, whether the text ended inside a string and
+	whether any comma was dropped.
+	"""
+	out: List[str] = []
+	stack: List[str] = []
+	cut_points: List[Tuple[int, str]] = []
+	in_string = False
+	escaped = False
+	dropped_comma = False
+	consumed = len(text)
+	for i, ch in enumerate(text):
+		if in_string:
+			out.append(ch)
+			if escaped:
+				escaped = False
+			elif ch == '\\':
+				escaped = True
+			elif ch == '"':
+				in_string = False
+			continue
+		if ch == '"':
+			in_string = True
+		elif ch in '{[':
+			stack.append('}' if ch == '{' else ']')
+			if len(stack) > 1:
+				# Cutting just inside a nested bracket leaves it empty instead of half-written
+				cut_points.append((len(out) + 1, ''.join(reversed(stack))))
+		elif ch in '}]':
+			# Drop a trailing comma before the closing bracket
+			last = len(out) - 1
+			while last >= 0 and out[last].isspace():
+				last -= 1
+			if last >= 0 and out[last] == ',':
+				del out[last]
+				dropped_comma = True
+			if stack:
+				stack.pop()
+			if not stack:
+				out.append(ch)
+				consumed = i + 1
+				break
+		elif ch == ',':
+			cut_points.append((len(out), ''.join(reversed(stack))))
+		out.append(ch)
+	return ''.join(out), consumed, cut_points, stack, in_string, dropped_comma
+
+
+def _repair_object(body: str, start: int) -> Optional[Tuple[Any, List[str]]]:
+	"""Try to read or repair one JSON object starting at the given brace."""
+	# Read exactly one object and ignore anything the model wrote around it
+	try:
+		value, end = json.JSONDecoder().raw_decode(body, start)
+	except json.JSONDecodeError:
+		pass
+	else:
+		repairs = ["surrounding_text"] if body[:start].strip() or body[end:].strip() else []
+		return value, repairs
+
+	cleaned, consumed, cut_points, stack, in_string, dropped_comma = _scan_json(body[start:])
+	repairs = []
+	if body[:start].strip() or body[start + consumed:].strip():
+		repairs.append("surrounding_text")
+	if dropped_comma:
+		repairs.append("trailing_comma")
+	if not stack and not in_string:
+		try:
+			return json.loads(cleaned), repairs
+		except json.JSONDecodeError:
+			return None
+
+	# Cut back to the last separator so a half-written key or value is dropped
+	# instead of guessed. Closing what is open is only safe outside a string.
+	candidates = [cleaned[:pos] + closers for pos, closers in reversed(cut_points)]
+	if not in_string:
+		candidates.insert(0, cleaned.rstrip().rstrip(',') + ''.join(reversed(stack)))
+	for candidate in candidates:
+		try:
+			value = json.loads(candidate)
+		except json.JSONDecodeError:
+			continue
+		return value, repairs + ["truncated"]
+	return None
+
+
+def repair_llm_json(text: str) -> Tuple[Any, List[str]]:
+	"""
+	Parse model output as JSON, repairing common defects locally:
+	markdown code fences, chatter around the object, trailing commas and
+	truncated strings/arrays/objects.
+	Returns the parsed value and the list of repairs that were applied.
+	Raises json.JSONDecodeError when the text cannot be recovered.
+	"""
+	try:
+		return json.loads(text), []
+	except json.JSONDecodeError as exc:
+		first_error = exc
+
+	repairs: List[str] = []
+	body = strip_code_fences(text)
+	if body != text:
+		repairs.append("code_fence")
+		try:
+			return json.loads(body), repairs
+		except json.JSONDecodeError:
+			pass
+
+	# Braces in leading chatter are skipped by trying each opening brace in turn
+	start = body.find('{')
+	while start != -1:
+		repaired = _repair_object(body, start)
+		if repaired is not None:
+			value, extra = repaired
+			return value, repairs + extra
+		start = body.find('{', start + 1)
+	raise first_error
+
+
 def load_prompt(prompt_name: str = "analysis") -> str:
 	"""
 	Load prompt template from prompts.txt file.
@@ -0,0 +1,103 @@
+import pytest
+from app.services.response_parser import (
+	ResponseValidationError,
+	get_parser_metrics,
+	parse_analysis_response,
+	reset_parser_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+	reset_parser_metrics()
+	yield
+	reset_parser_metrics()
+
+
+def test_valid_response_parses_clean():
+	raw = '{"summary": "s", "title": "t", "topics": ["a"], "sentiment": "positive"}'
+	result = parse_analysis_response(raw, "doc")
+	assert result == {"summary": "s", "title": "t", "topics": ["a"], "sentiment": "positive"}
+	assert get_parser_metrics()["counts"]["parsed_clean"] == 1
+
+
+def test_topics_and_sentiment_are_coerced():
+	raw = '```json\n{"summary": "s", "title": "t", "topics": ["a, b", ["c", 3]], "sentiment": "Positive."}\n```'
+	result = parse_analysis_response(raw, "doc")
+	assert result["topics"] == ["a", "b", "c", "3"]
+	assert result["sentiment"] == "positive"
+	counts = get_parser_metrics()["counts"]
+	assert counts["repaired_locally"] == 1
+	assert counts["repair_code_fence"] == 1
+	assert counts["repair_topics_coerced"] == 1
+	assert counts["repair_sentiment_coerced"] == 1
+
+
+@pytest.mark.parametrize("raw, field", [
+	('{"summary": "s", "title": "t", "topics": ["a"], "sentiment": ["x"]}', "sentiment"),
+	('{"summary": "s", "title": "t", "topics": ["a"], "sentiment": "mixed"}', "sentiment"),
+	('{"summary": "s", "title": "t", "topics": {"a": 1}, "sentiment": "neutral"}', "topics"),
+	('{"summary": "s", "title": "t", "topics": ["a", {"b": 1}], "sentiment": "neutral"}', "topics"),
+	('{"summary": "s", "title": "t"', "topics"),
+])
+def test_invalid_field_needs_reask(raw, field):
+	with pytest.raises(ResponseValidationError, match=field):
+		parse_analysis_response(raw, "doc")
+	assert get_parser_metrics()["counts"]["failed"] == 1
+
+
+def test_reask_fills_missing_fields():
+	prompts = []
+
+	def reask(prompt):
+		prompts.append(prompt)
+		return '```json\n{"title": "t2"}\n```'
+
+	result = parse_analysis_response('{"summary": "s", "topics": ["a"', "doc", reask=reask)
+	assert result["title"] == "t2"
+	assert result["summary"] == "s"
+	assert len(prompts) == 1
+	assert "title" in prompts[0]
+	assert "doc" not in prompts[0]
+	metrics = get_parser_metrics()
+	assert metrics["counts"]["reask_succeeded"] == 1
+	assert metrics["counts"]["reask_repair_code_fence"] == 1
+	assert metrics["reask_rate"] == 1.0
+	assert metrics["reask_full_text_rate"] == 0.0
+
+
+def test_truncated_summary_reasks_with_full_text():
+	prompts = []
+	text = "x" * 5000
+
+	def reask(prompt):
+		prompts.append(prompt)
+		return '{"summary": "s", "title": "t", "topics": ["a"], "sentiment": "neutral"}'
+
+	result = parse_analysis_response('{"summary": "The market rall', text, reask=reask)
+	assert result["summary"] == "s"
+	assert text in prompts[0]
+	assert get_parser_metrics()["counts"]["reask_full_text"] == 1
+
+
+def test_reask_failure_raises_and_counts():
+	with pytest.raises(ResponseValidationError):
+		parse_analysis_response("garbage", "doc", reask=lambda prompt: "still garbage")
+	assert get_parser_metrics()["counts"]["failed"] == 1
+
+
+def test_reask_exception_counts_as_failure():
+	def reask(prompt):
+		raise RuntimeError("network down")
+
+	with pytest.raises(RuntimeError):
+		parse_analysis_response('{"summary": "s"}', "doc", reask=reask)
+	assert get_parser_metrics()["failure_rate"] == 1.0
+
+
+def test_non_text_reply_is_unparseable():
+	with pytest.raises(ResponseValidationError):
+		parse_analysis_response(None, "doc", reask=lambda prompt: None)
+	counts = get_parser_metrics()["counts"]
+	assert counts["unparseable"] == 2
+	assert counts["failed"] == 1
@@ -0,0 +1,88 @@
+import json
+import pytest
+from app.utils.text_utils import repair_llm_json
+
+
+@pytest.mark.parametrize("raw, expected, repairs", [
+	(
+		'{"summary": "s", "title": "t", "topics": ["a"], "sentiment": "neutral"}',
+		{"summary": "s", "title": "t", "topics": ["a"], "sentiment": "neutral"},
+		[],
+	),
+	(
+		'{"summary": "Use ```code``` blocks", "title": "t", "topics": ["a"], "sentiment": "neutral"}',
+		{"summary": "Use ```code``` blocks", "title": "t", "topics": ["a"], "sentiment": "neutral"},
+		[],
+	),
+	(
+		'```json\n{"summary": "s", "title": "t"}\n```',
+		{"summary": "s", "title": "t"},
+		["code_fence"],
+	),
+	(
+		'{"summary": "s", "topics": ["a", "b",],}',
+		{"summary": "s", "topics": ["a", "b"]},
+		["trailing_comma"],
+	),
+	(
+		'{"summary": "s", "title": "He said \\"hi',
+		{"summary": "s"},
+		["truncated"],
+	),
+	(
+		'{"summary": "s", "topics": ["a", "b',
+		{"summary": "s", "topics": ["a"]},
+		["truncated"],
+	),
+	(
+		'{"summary": "s", "topics": ["a", "b"',
+		{"summary": "s", "topics": ["a", "b"]},
+		["truncated"],
+	),
+	(
+		'{"summary": "s", "topics": ["ab',
+		{"summary": "s", "topics": []},
+		["truncated"],
+	),
+	(
+		'{"summary": "s", "tit',
+		{"summary": "s"},
+		["truncated"],
+	),
+	(
+		'{"summary": "a}b", "title": "t", "topics": ["a", "b',
+		{"summary": "a}b", "title": "t", "topics": ["a"]},
+		["truncated"],
+	),
+	(
+		'Here you go: {"summary": "s", "title": "t"} hope that helps {}',
+		{"summary": "s", "title": "t"},
+		["surrounding_text"],
+	),
+	(
+		'Sure {here}: {"summary": "s", "title": "t"}',
+		{"summary": "s", "title": "t"},
+		["surrounding_text"],
+	),
+	(
+		'{\n "summary": "s",\n "topics": ["a"\n ],\n "title": "abc',
+		{"summary": "s", "topics": ["a"]},
+		["truncated"],
+	),
+	(
+		'```json\n{"summary": "s", "topics": ["a",\n',
+		{"summary": "s", "topics": ["a"]},
+		["code_fence", "truncated"],
+	),
+])
+def test_repair_llm_json(raw, expected, repairs):
+	assert repair_llm_json(raw) == (expected, repairs)
+
+
+@pytest.mark.parametrize("raw", [
+	"no json here",
+	'{"summary": "The market rall',
+])
+def test_repair_llm_json_unrecoverable(raw):
+	with pytest.raises(json.JSONDecodeError):
+		repair_llm_json(raw)